@@ -1,47 +1,115 @@
 # main.py
 
+import asyncio
+import hashlib
+import logging
 import os
-import random
 import re
 import json
 import csv
 import io
+import time
 from datetime import UTC, date, datetime, timedelta
+from functools import lru_cache
 from typing import Annotated, Dict, Any, List, Optional
 
-from fastapi import FastAPI, Request, Depends, HTTPException, Body, Query
+from fastapi import FastAPI, Request, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
 from fastapi.datastructures import FormData
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response
+from fastapi.responses import (
+    HTMLResponse,
+    ORJSONResponse,
+    RedirectResponse,
+    Response,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session, joinedload
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 
 from models import MealDay, Meal, MealType, SessionLocal, init_db
 import uvicorn
 
-# Initialize FastAPI app
-app = FastAPI()
+logger = logging.getLogger(__name__)
 
-# Set up database connection and tables
-init_db()
+# Initialize FastAPI app; orjson serializes responses (dates included)
+# a few times faster than the stdlib encoder
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Mount static file handling and Jinja2 templating
 app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+
+if os.getenv("ENV") == "prod":
+    # Templates don't change under a deployed worker, so skip the per-render
+    # stat/recompile and persist compiled bytecode across restarts. Jinja2
+    # won't create the cache directory for an explicit path, so make it here.
+    os.makedirs("/tmp/jinja_cache", exist_ok=True)
+    _jinja_env = Environment(
+        loader=FileSystemLoader("templates"),
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache("/tmp/jinja_cache"),
+        autoescape=select_autoescape(),
+    )
+    templates = Jinja2Templates(env=_jinja_env)
+else:
+    templates = Jinja2Templates(directory="templates")
 
 # Constant for UI and API logic
 DAYS = 9
 DAYS_BACKWARDS = 3  # How many days backwards to show on /backwards
 MEAL_TYPE_SORT_ORDER = {"breakfast": 0, "lunch": 1, "dinner": 2}
 
+# Maps the Meal.type enum to its payload/form field name
+_FIELD_BY_TYPE = {
+    MealType.breakfast: "breakfast",
+    MealType.lunch: "lunch",
+    MealType.dinner: "dinner",
+}
+
+# Matches form keys like days[0][breakfast]; compiled once at import time
+_DAY_FIELD_RE = re.compile(r"days\[(\d+)\]\[(\w+)\]")
+
+
+# --------- REQUEST PAYLOADS --------------------
+class MealFlags(BaseModel):
+    """Per-meal flags nested under a day's 'meals' block."""
+
+    is_takeout: bool | str = "off"
+    is_favorite: bool | str = "off"
+    cooking_user: Optional[str] = None
+
+
+class DayPayload(BaseModel):
+    id: int
+    is_starred: bool = False
+    is_sammy_working: bool = False
+    breakfast: str = ""
+    lunch: str = ""
+    dinner: str = ""
+    meals: Dict[str, MealFlags] = Field(default_factory=dict)
+
+
+class SavePayload(BaseModel):
+    day: Optional[DayPayload] = None
+    days: Optional[List[DayPayload]] = None
 
-def get_db():
+
+class CopyWeekPayload(BaseModel):
+    from_date: date
+    to_date: date
+    overwrite: bool = False
+
+
+async def get_db():
     """Yield DB session for request context"""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
 
 
 def _sorted_meals(meals: list[Meal]) -> list[Meal]:
@@ -51,13 +119,13 @@ def _sorted_meals(meals: list[Meal]) -> list[Meal]:
     )
 
 
-def _fetch_meal_days_for_export(db: Session) -> list[MealDay]:
-    return (
-        db.query(MealDay)
-        .options(joinedload(MealDay.meals))
+async def _fetch_meal_days_for_export(db: AsyncSession) -> list[MealDay]:
+    result = await db.execute(
+        select(MealDay)
+        .options(selectinload(MealDay.meals), raiseload("*"))
         .order_by(MealDay.date.asc())
-        .all()
     )
+    return result.scalars().all()
 
 
 def _serialize_meal(meal: Meal) -> dict[str, Any]:
@@ -94,39 +162,70 @@ def _build_export_summary(meal_days: list[MealDay]) -> dict[str, Any]:
     }
 
 
+async def _load_meal_day_window(
+    db: AsyncSession, dates: list[date]
+) -> dict[date, MealDay]:
+    """One query for a list of dates, meals eager-loaded, keyed by date."""
+    result = await db.execute(
+        select(MealDay)
+        .options(selectinload(MealDay.meals), raiseload("*"))
+        .where(MealDay.date.in_(dates))
+    )
+    return {meal_day.date: meal_day for meal_day in result.scalars()}
+
+
 # --------- HTML VIEWS --------------------------
 @app.get("/", response_class=HTMLResponse)
-def read_index(request: Request):
+async def read_index(request: Request, db: AsyncSession = Depends(get_db)):
     """
     Homepage HTML — displays next N days of meals.
     """
-    db = next(get_db())
     today = date.today()
-    days = []
-
-    # Ensure we have MealDay and Meal entries for the next N days
-    for i in range(DAYS):
-        current_date = today + timedelta(days=i)
-        meal_day = (
-            db.query(MealDay)
-            .options(joinedload(MealDay.meals))
-            .filter(MealDay.date == current_date)
-            .first()
+    dates = [today + timedelta(days=i) for i in range(DAYS)]
+
+    # Fetch the whole window in one query instead of one SELECT per day
+    by_date = await _load_meal_day_window(db, dates)
+
+    # Missing days get a MealDay plus empty meal rows via INSERT IGNORE, so
+    # two concurrent cold starts can't race each other on the unique date
+    missing = [current_date for current_date in dates if current_date not in by_date]
+    if missing:
+        await db.execute(
+            insert(MealDay).prefix_with("IGNORE"),
+            [{"date": current_date} for current_date in missing],
+        )
+        id_rows = await db.execute(select(MealDay.id).where(MealDay.date.in_(missing)))
+        await db.execute(
+            insert(Meal).prefix_with("IGNORE"),
+            [
+                {"meal_day_id": meal_day_id, "type": meal_type}
+                for meal_day_id in id_rows.scalars()
+                for meal_type in MealType
+            ],
         )
+        await db.commit()
 
-        # If not found, create meal day with meal rows with null descriptions
-        if not meal_day:
-            meal_day = MealDay(date=current_date)
-            meal_day.meals = [
-                Meal(type=MealType.breakfast),
-                Meal(type=MealType.lunch),
-                Meal(type=MealType.dinner),
-            ]
-            db.add(meal_day)
-            db.commit()
-            db.refresh(meal_day)
-
-        days.append(meal_day)
+        # Re-read the window so the fresh days come back with meals loaded
+        by_date = await _load_meal_day_window(db, dates)
+
+    days = [by_date[current_date] for current_date in dates]
+
+    # For a given window the page only changes when meal rows are edited;
+    # fingerprint it so repeat polls (the autosave UI re-hits /) can
+    # short-circuit with a 304 instead of re-rendering the template
+    hasher = hashlib.blake2b(digest_size=16)
+    for meal_day in days:
+        hasher.update(
+            f"{meal_day.id}:{meal_day.is_starred}:{meal_day.is_sammy_working}".encode()
+        )
+        for meal in _sorted_meals(meal_day.meals):
+            hasher.update(
+                f"|{meal.id}:{meal.description or ''}:{meal.cooking_user or ''}"
+                f":{meal.is_favorite}:{meal.is_takeout}".encode()
+            )
+    etag = f'"{hasher.hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
 
     # Define template configuration: show_days_until_payday, show_meal_metrics
     template_config = {
@@ -140,30 +239,21 @@ def read_index(request: Request):
     return templates.TemplateResponse(
         "index.html",
         {"request": request, "days": days, "template_config": template_config},
+        headers={"ETag": etag},
     )
 
 
 @app.get("/backwards", response_class=HTMLResponse)
-def backwards_index(request: Request):
+async def backwards_index(request: Request, db: AsyncSession = Depends(get_db)):
     """
     Homepage HTML — displays last N days of meals.
     """
-    db = next(get_db())
     today = date.today()
-    days = []
-
-    for i in range(1, DAYS_BACKWARDS + 1):
-        current_date = today - timedelta(days=i)
-        meal_day = (
-            db.query(MealDay)
-            .options(joinedload(MealDay.meals))
-            .filter(MealDay.date == current_date)
-            .first()
-        )
-        days.append(meal_day)
 
-    # Reverse to show oldest first
-    days.reverse()
+    # Oldest first; one range query instead of one SELECT per day
+    dates = [today - timedelta(days=i) for i in range(DAYS_BACKWARDS, 0, -1)]
+    by_date = await _load_meal_day_window(db, dates)
+    days = [by_date.get(current_date) for current_date in dates]
 
     # Define template configuration
     template_config = {
@@ -180,66 +270,156 @@ def backwards_index(request: Request):
     )
 
 
+@app.post("/save")
+async def save_day(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Full-form save posted by index.html. Parses days[i][field] keys into
+    per-day dicts and applies them the same way /api/save does.
+    """
+    form = await request.form()
+
+    days_data: Dict[str, Dict[str, str]] = {}
+    for key, value in form.multi_items():
+        match = _DAY_FIELD_RE.fullmatch(key)
+        if match:
+            idx, field = match.group(1), match.group(2)
+            days_data.setdefault(idx, {})[field] = value
+
+    days_payload = []
+    for fields in days_data.values():
+        if "id" not in fields:
+            continue
+        days_payload.append(
+            {
+                "id": int(fields["id"]),
+                "is_starred": is_truthy(fields.get("is_starred", "off")),
+                "is_sammy_working": is_truthy(fields.get("is_sammy_working", "off")),
+                "breakfast": fields.get("breakfast", ""),
+                "lunch": fields.get("lunch", ""),
+                "dinner": fields.get("dinner", ""),
+            }
+        )
+
+    await _update_days_from_payload(days_payload, db)
+    await db.commit()
+    _invalidate_meal_cache()
+    return RedirectResponse("/", status_code=303)
+
+
 # --------- API VIEWS --------------------------
-def _update_days_from_payload(days: list[dict], db):
+async def _update_days_from_payload(days: list[dict], db: AsyncSession):
+    # One IN query (with meals eager-loaded) instead of one SELECT per day
+    ids = [int(day["id"]) for day in days]
+    result = await db.execute(
+        select(MealDay)
+        .options(selectinload(MealDay.meals), raiseload("*"))
+        .where(MealDay.id.in_(ids))
+    )
+    rows = result.scalars().all()
+    by_id = {meal_day.id: meal_day for meal_day in rows}
+
+    # Collect the new values and flush them as two bulk UPDATE-by-primary-key
+    # statements instead of one ORM UPDATE per mutated row
+    day_updates = []
+    meal_updates = []
+    # Description-only updates for payloads without a meals block; kept in a
+    # separate list so each bulk UPDATE's parameter sets stay homogeneous
+    meal_desc_updates = []
+
     for day in days:
-        meal_day = db.query(MealDay).filter(MealDay.id == day["id"]).first()
+        meal_day = by_id.get(int(day["id"]))
         if not meal_day:
             continue
 
-        meal_day.is_starred = day.get("is_starred", False)
-        meal_day.is_sammy_working = day.get("is_sammy_working", False)
-
-        meals_by_type = {meal.type.value: meal for meal in meal_day.meals}
+        day_updates.append(
+            {
+                "id": meal_day.id,
+                "is_starred": day.get("is_starred", False),
+                "is_sammy_working": day.get("is_sammy_working", False),
+            }
+        )
 
-        for meal_type in ["breakfast", "lunch", "dinner"]:
-            meal = meals_by_type.get(meal_type)
-            if not meal:
+        for meal in meal_day.meals:
+            meal_type = _FIELD_BY_TYPE.get(meal.type)
+            if not meal_type:
                 continue
 
             # Update description
             desc = day.get(meal_type, "")
             if isinstance(desc, str) and desc.strip().lower() not in ("none", ""):
-                meal.description = desc.strip()
+                description = desc.strip()
             else:
-                meal.description = None
+                description = None
+
+            # Payloads without a meals block (the no-JS form post) only carry
+            # descriptions; leave flags and cooking_user untouched for them
+            if "meals" not in day:
+                meal_desc_updates.append({"id": meal.id, "description": description})
+                logger.debug(
+                    "Queued %s update for day %s: %s",
+                    meal_type,
+                    meal_day.date,
+                    meal_desc_updates[-1],
+                )
+                continue
 
             # Get nested fields from "meals" block in payload
-            meal_fields = day.get("meals", {}).get(meal_type, {})
-
-            # Update is_takeout if present
-            if meal.is_takeout is not None or "is_takeout" in meal_fields:
-                # Print the current value and new updated value
-                print(
-                    f"Current {meal_type} for day {meal_day.date}: is_takeout={meal.is_takeout} -> New: {meal_fields.get('is_takeout', 'off')}"
-                )
-                # Make change
-                meal.is_takeout = is_truthy(meal_fields.get("is_takeout", "off"))
+            meal_fields = day["meals"].get(meal_type, {})
 
-            # Update cooking_user and is_favorite correctly if present
+            # cooking_user only changes when the column is set or the payload
+            # carries the key; otherwise keep the stored value
             if meal.cooking_user is not None or "cooking_user" in meal_fields:
-                # Print the current value and new updated value
-                print(
-                    f"Current {meal_type} for day {meal_day.date}: cooking_user={meal.cooking_user} -> New: {meal_fields.get('cooking_user', 'None')}"
-                )
-                # Make change
-                meal.cooking_user = meal_fields.get("cooking_user", None)
+                cooking_user = meal_fields.get("cooking_user", None)
             else:
-                print(
-                    f"SKIPPING cooking_user update for {meal_type} on day {meal_day.date} as it's not in payload"
-                )
+                cooking_user = meal.cooking_user
+
+            meal_updates.append(
+                {
+                    "id": meal.id,
+                    "description": description,
+                    "cooking_user": cooking_user,
+                    "is_takeout": is_truthy(meal_fields.get("is_takeout", "off")),
+                    "is_favorite": is_truthy(meal_fields.get("is_favorite", "off")),
+                }
+            )
+            logger.debug(
+                "Queued %s update for day %s: %s",
+                meal_type,
+                meal_day.date,
+                meal_updates[-1],
+            )
 
-            if meal.is_favorite is not None or "is_favorite" in meal_fields:
-                # Print the current value and new updated value
-                print(
-                    f"Current {meal_type} for day {meal_day.date}: is_favorite={meal.is_favorite} -> New: {meal_fields.get('is_favorite', 'off')}"
-                )
-                # Make change
-                meal.is_favorite = is_truthy(meal_fields.get("is_favorite", "off"))
-            else:
-                print(
-                    f"SKIPPING is_favorite update for {meal_type} on day {meal_day.date} as it's not in payload"
-                )
+    if day_updates:
+        await db.execute(update(MealDay), day_updates)
+    if meal_updates:
+        await db.execute(update(Meal), meal_updates)
+    if meal_desc_updates:
+        await db.execute(update(Meal), meal_desc_updates)
+
+
+# Small in-process cache for meal-derived reads; cleared whenever meals change
+MEAL_CACHE_TTL_SECONDS = 3600
+_meal_cache: Dict[str, Any] = {}
+
+
+def _cache_get(key: str) -> Any:
+    entry = _meal_cache.get(key)
+    if not entry:
+        return None
+    expires_at, value = entry
+    if time.monotonic() >= expires_at:
+        _meal_cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_set(key: str, value: Any, ttl_seconds: float = MEAL_CACHE_TTL_SECONDS) -> Any:
+    _meal_cache[key] = (time.monotonic() + ttl_seconds, value)
+    return value
+
+
+def _invalidate_meal_cache():
+    _meal_cache.clear()
 
 
 def is_truthy(value: Any) -> bool:
@@ -250,93 +430,185 @@ def is_truthy(value: Any) -> bool:
     return False
 
 
-@app.post("/api/save", response_class=JSONResponse)
-def api_save(payload: Dict[str, Any] = Body(...)):
+@app.post("/api/save")
+async def api_save(payload: SavePayload, db: AsyncSession = Depends(get_db)):
     """
     Accepts:
       {"day": {...}}  or  {"days": [{...}, ...]}
     Updates the database and returns a JSON response.
     """
-    db = next(get_db())
-
-    if "day" in payload:
-        days_payload = [payload["day"]]
-    elif "days" in payload:
-        days_payload = payload["days"]
+    if payload.day is not None:
+        day_models = [payload.day]
+    elif payload.days is not None:
+        day_models = payload.days
     else:
         raise HTTPException(status_code=400, detail="Missing 'day' or 'days' field.")
 
-    for d in days_payload:
-        if "id" not in d:
-            raise HTTPException(status_code=422, detail="Each day must have an 'id'.")
-
-    _update_days_from_payload(days_payload, db)
-    db.commit()
+    # exclude_unset keeps the "was this flag actually sent" semantics the
+    # update helper relies on
+    days_payload = [day.model_dump(exclude_unset=True) for day in day_models]
+    await _update_days_from_payload(days_payload, db)
+    await db.commit()
+    _invalidate_meal_cache()
     return {"status": "ok"}
 
 
-@app.get("/api/favorites")
-def get_favorites(limit: int = 200):
-    db = SessionLocal()
-    safe_limit = max(1, min(limit, 500))
-    try:
-        favorites = (
-            db.query(Meal.description)
-            .filter(Meal.is_favorite == True)
-            .filter(Meal.description.isnot(None))
-            .filter(Meal.description != "")
+async def _copy_week(
+    db: AsyncSession, from_date: date, to_date: date, overwrite: bool
+) -> int:
+    """
+    Copies meal descriptions for the DAYS-long window starting at
+    'from_date' onto the window starting at 'to_date'; returns the number
+    of days copied. Raises 409 on conflicts unless 'overwrite' is set.
+    """
+    # Both windows as precomputed lists; every query below works off these
+    src_dates = [from_date + timedelta(days=i) for i in range(DAYS)]
+    tgt_dates = [to_date + timedelta(days=i) for i in range(DAYS)]
+
+    # Refuse to clobber target days that already have meals typed in; the DB
+    # filters for non-empty descriptions so only the dates come over the wire
+    if not overwrite:
+        conflict_result = await db.execute(
+            select(MealDay.date)
+            .join(Meal)
+            .where(
+                MealDay.date.between(tgt_dates[0], tgt_dates[-1]),
+                func.length(func.trim(Meal.description)) > 0,
+            )
             .distinct()
-            .order_by(Meal.description.asc())
-            .limit(safe_limit)
-            .all()
         )
-        return [{"meal_text": m[0]} for m in favorites if m[0]]
-    finally:
-        db.close()
+        conflicts = sorted(day.isoformat() for day in conflict_result.scalars())
+        if conflicts:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Target days already have meals: {', '.join(conflicts)}",
+            )
+
+    # One range query over the source window instead of per-day SELECTs
+    src_result = await db.execute(
+        select(MealDay)
+        .options(selectinload(MealDay.meals), raiseload("*"))
+        .where(MealDay.date.in_(src_dates))
+    )
+    src_by_date = {meal_day.date: meal_day for meal_day in src_result.scalars()}
+    if not src_by_date:
+        return 0
+
+    # Make sure every needed target day exists; INSERT IGNORE keeps this
+    # race-safe against the unique date column
+    needed = [
+        tgt_date
+        for src_date, tgt_date in zip(src_dates, tgt_dates)
+        if src_date in src_by_date
+    ]
+    await db.execute(
+        insert(MealDay).prefix_with("IGNORE"),
+        [{"date": tgt_date} for tgt_date in needed],
+    )
+    tgt_id_result = await db.execute(
+        select(MealDay.date, MealDay.id).where(MealDay.date.in_(needed))
+    )
+    tgt_id_by_date = dict(tgt_id_result.all())
+
+    # One server-side upsert keyed on uq_meal_day_type replaces per-meal
+    # matching in Python and individual INSERT/UPDATE round trips
+    values = []
+    for src_date, tgt_date in zip(src_dates, tgt_dates):
+        src_day = src_by_date.get(src_date)
+        if not src_day:
+            continue
+        for meal in src_day.meals:
+            values.append(
+                {
+                    "meal_day_id": tgt_id_by_date[tgt_date],
+                    "type": meal.type,
+                    "description": meal.description,
+                }
+            )
+    if values:
+        stmt = mysql_insert(Meal).values(values)
+        await db.execute(
+            stmt.on_duplicate_key_update(description=stmt.inserted.description)
+        )
+    return len(needed)
+
+
+@app.post("/api/copy-week")
+async def api_copy_week(payload: CopyWeekPayload, db: AsyncSession = Depends(get_db)):
+    """
+    Accepts:
+      {"from_date": "YYYY-MM-DD", "to_date": "YYYY-MM-DD", "overwrite": false}
+    Copies the window of meal descriptions and returns a JSON response.
+    """
+    copied_days = await _copy_week(
+        db, payload.from_date, payload.to_date, payload.overwrite
+    )
+    await db.commit()
+    _invalidate_meal_cache()
+    return {"status": "ok", "copied_days": copied_days}
 
 
-@app.get("/api/veggies", response_class=JSONResponse)
-def get_veggies_eaten():
+@app.get("/api/favorites")
+async def get_favorites(limit: int = 200, db: AsyncSession = Depends(get_db)):
+    safe_limit = max(1, min(limit, 500))
+    cached = _cache_get(f"favorites:{safe_limit}")
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(Meal.description)
+        .where(Meal.is_favorite == True)
+        .where(Meal.description.isnot(None))
+        .where(Meal.description != "")
+        .distinct()
+        .order_by(Meal.description.asc())
+        .limit(safe_limit)
+    )
+    favorites = result.all()
+
+    return _cache_set(
+        f"favorites:{safe_limit}", [{"meal_text": m[0]} for m in favorites if m[0]]
+    )
+
+
+async def _meal_texts_since(start: date, end: Optional[date] = None) -> list[str]:
+    """Lowercased meal descriptions for days on/after start (and on/before end)."""
+    stmt = select(Meal.description).join(MealDay).where(MealDay.date >= start)
+    if end is not None:
+        stmt = stmt.where(MealDay.date <= end)
+
+    # Own session per call so concurrent callers can overlap their queries
+    async with SessionLocal() as db:
+        rows = (await db.execute(stmt)).all()
+    return [m[0].lower() for m in rows if m[0]]
+
+
+@app.get("/api/veggies")
+async def get_veggies_eaten():
     today = datetime.today().date()
 
     veggies = None
     with open("./static/veggies.json", "r") as f:
         veggies = json.load(f)
 
-    db = SessionLocal()
-    # This month
+    # This month / last month window bounds
     first_of_month = today.replace(day=1)
-    meals_this_month = (
-        db.query(Meal.description)
-        .join(MealDay)
-        .filter(MealDay.date >= first_of_month)
-        .all()
-    )
-    meal_texts_this_month = [m[0].lower() for m in meals_this_month if m[0]]
-    veggie_count_this_month = sum(
-        1 for text in meal_texts_this_month if any(veggie in text for veggie in veggies)
-    )
-
-    # Last month
     if first_of_month.month == 1:
         last_month = first_of_month.replace(year=first_of_month.year - 1, month=12)
     else:
         last_month = first_of_month.replace(month=first_of_month.month - 1)
     first_of_last_month = last_month
-    # Get last day of last month
-    if first_of_month.month == 1:
-        last_day_of_last_month = first_of_month - timedelta(days=1)
-    else:
-        last_day_of_last_month = first_of_month - timedelta(days=1)
-    meals_last_month = (
-        db.query(Meal.description)
-        .join(MealDay)
-        .filter(MealDay.date >= first_of_last_month)
-        .filter(MealDay.date <= last_day_of_last_month)
-        .all()
+    last_day_of_last_month = first_of_month - timedelta(days=1)
+
+    # The two month windows are independent; overlap their round-trips
+    meal_texts_this_month, meal_texts_last_month = await asyncio.gather(
+        _meal_texts_since(first_of_month),
+        _meal_texts_since(first_of_last_month, last_day_of_last_month),
+    )
+
+    veggie_count_this_month = sum(
+        1 for text in meal_texts_this_month if any(veggie in text for veggie in veggies)
     )
-    db.close()
-    meal_texts_last_month = [m[0].lower() for m in meals_last_month if m[0]]
     veggie_count_last_month = sum(
         1 for text in meal_texts_last_month if any(veggie in text for veggie in veggies)
     )
@@ -347,76 +619,85 @@ def get_veggies_eaten():
     }
 
 
-@app.get("/api/next-payday", response_class=JSONResponse)
-def get_next_payday():
-    today = datetime.today().date()
+def _next_payday_ordinal(today_ord: int, anchor_ord: int) -> int:
+    """
+    First payday ordinal strictly after today on a 14-day cycle. Floor
+    division covers dates on either side of the anchor, so no loop is needed.
+    """
+    periods_passed = (today_ord - anchor_ord) // 14
+    return anchor_ord + (periods_passed + 1) * 14
 
-    # Anchor payday: Thursday, Sep 18, 2025
-    anchor = datetime(2025, 9, 18).date()
-    delta = (today - anchor).days
-
-    # Figure out how many pay periods have passed
-    if delta >= 0:
-        # Paydays after anchor
-        periods_passed = delta // 14
-        next_payday = anchor + timedelta(days=(periods_passed + 1) * 14)
-    else:
-        # Paydays before anchor
-        weeks_behind = abs(delta) // 14
-        next_payday = anchor - timedelta(days=weeks_behind * 14)
-        while next_payday <= today:
-            next_payday += timedelta(days=14)
 
-    days_until = (next_payday - today).days
+@lru_cache(maxsize=1)
+def _payday_for(today: date) -> dict[str, Any]:
+    """Pure function of the current date; cached so repeat hits are a dict lookup."""
+    # Anchor payday: Thursday, Sep 18, 2025
+    anchor = date(2025, 9, 18)
+    next_payday = date.fromordinal(
+        _next_payday_ordinal(today.toordinal(), anchor.toordinal())
+    )
 
     return {
-        "days_until_next_payday": days_until,
+        "days_until_next_payday": (next_payday - today).days,
         "next_payday_date": next_payday.strftime("%Y-%m-%d"),
     }
 
 
-@app.get("/api/search", response_class=JSONResponse)
-def get_search_meal(
+@app.get("/api/next-payday")
+def get_next_payday():
+    now = datetime.now()
+    today = now.date()
+
+    # Result only changes at local midnight, so let clients cache until then
+    midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+    max_age = max(int((midnight - now).total_seconds()), 1)
+
+    return ORJSONResponse(
+        content=_payday_for(today),
+        headers={"Cache-Control": f"public, max-age={max_age}"},
+    )
+
+
+@app.get("/api/search")
+async def get_search_meal(
     query: str = "",
     favorites_only: Optional[bool] = False,
     only_favorites: Optional[bool] = Query(default=None),
     include_takeout: Optional[bool] = False,
     limit: int = 60,
+    db: AsyncSession = Depends(get_db),
 ):
     term = (query or "").strip()
     if not term:
         return {"results": []}
 
-    db = SessionLocal()
     safe_limit = max(1, min(limit, 200))
     use_favorites_filter = is_truthy(favorites_only) or is_truthy(only_favorites)
 
-    try:
-        query_obj = (
-            db.query(Meal.description)
-            .filter(Meal.description.isnot(None))
-            .filter(Meal.description != "")
-            .filter(Meal.description.ilike(f"%{term}%"))
-        )
-        if use_favorites_filter:
-            query_obj = query_obj.filter(Meal.is_favorite == True)
-        if not is_truthy(include_takeout):
-            query_obj = query_obj.filter(Meal.is_takeout == False)
-
-        rows = query_obj.order_by(Meal.id.desc()).limit(safe_limit).all()
-
-        seen = set()
-        deduped = []
-        for (text,) in rows:
-            normalized = text.strip().lower()
-            if not normalized or normalized in seen:
-                continue
-            seen.add(normalized)
-            deduped.append(text.strip())
+    stmt = (
+        select(Meal.description)
+        .where(Meal.description.isnot(None))
+        .where(Meal.description != "")
+        .where(Meal.description.ilike(f"%{term}%"))
+    )
+    if use_favorites_filter:
+        stmt = stmt.where(Meal.is_favorite == True)
+    if not is_truthy(include_takeout):
+        stmt = stmt.where(Meal.is_takeout == False)
+
+    result = await db.execute(stmt.order_by(Meal.id.desc()).limit(safe_limit))
+    rows = result.all()
+
+    seen = set()
+    deduped = []
+    for (text,) in rows:
+        normalized = text.strip().lower()
+        if not normalized or normalized in seen:
+            continue
+        seen.add(normalized)
+        deduped.append(text.strip())
 
-        return {"results": deduped}
-    finally:
-        db.close()
+    return {"results": deduped}
 
 
 @app.get("/search", response_class=HTMLResponse)
@@ -438,13 +719,9 @@ def get_search(request: Request):
 
 
 @app.get("/export", response_class=HTMLResponse)
-def get_export_page(request: Request):
-    db = SessionLocal()
-    try:
-        meal_days = _fetch_meal_days_for_export(db)
-        export_summary = _build_export_summary(meal_days)
-    finally:
-        db.close()
+async def get_export_page(request: Request, db: AsyncSession = Depends(get_db)):
+    meal_days = await _fetch_meal_days_for_export(db)
+    export_summary = _build_export_summary(meal_days)
 
     template_config = {
         "title": "Export",
@@ -465,20 +742,16 @@ def get_export_page(request: Request):
 
 
 @app.get("/api/export/meals.json")
-def export_meals_json():
-    db = SessionLocal()
-    try:
-        meal_days = _fetch_meal_days_for_export(db)
-        payload = {
-            "generated_at": datetime.now(UTC)
-            .isoformat(timespec="seconds")
-            .replace("+00:00", "Z"),
-            "meal_day_count": len(meal_days),
-            "meal_count": sum(len(meal_day.meals) for meal_day in meal_days),
-            "meal_days": [_serialize_meal_day(meal_day) for meal_day in meal_days],
-        }
-    finally:
-        db.close()
+async def export_meals_json(db: AsyncSession = Depends(get_db)):
+    meal_days = await _fetch_meal_days_for_export(db)
+    payload = {
+        "generated_at": datetime.now(UTC)
+        .isoformat(timespec="seconds")
+        .replace("+00:00", "Z"),
+        "meal_day_count": len(meal_days),
+        "meal_count": sum(len(meal_day.meals) for meal_day in meal_days),
+        "meal_days": [_serialize_meal_day(meal_day) for meal_day in meal_days],
+    }
 
     return Response(
         content=json.dumps(payload, indent=2),
@@ -490,12 +763,8 @@ def export_meals_json():
 
 
 @app.get("/api/export/meals.csv")
-def export_meals_csv():
-    db = SessionLocal()
-    try:
-        meal_days = _fetch_meal_days_for_export(db)
-    finally:
-        db.close()
+async def export_meals_csv(db: AsyncSession = Depends(get_db)):
+    meal_days = await _fetch_meal_days_for_export(db)
 
     output = io.StringIO()
     writer = csv.writer(output, lineterminator="\n")
@@ -540,53 +809,69 @@ def export_meals_csv():
     )
 
 
-@app.get("/api/how-many-times", response_class=JSONResponse)
-def get_how_many_times_eat_out():
-    db = SessionLocal()
-    # Get count of meals where is_takeout is True in the last 7 days
+@app.get("/api/how-many-times")
+async def get_how_many_times_eat_out(db: AsyncSession = Depends(get_db)):
+    # Shown on every homepage render; a short TTL keeps it off the DB
+    cached = _cache_get("how-many-times")
+    if cached is not None:
+        return cached
+
+    # Get count of meals where is_takeout is True in the last 7 days;
+    # a plain scalar COUNT avoids the subquery Query.count() wraps around
     seven_days_ago = date.today() - timedelta(days=7)
-    count = (
-        db.query(Meal)
+    result = await db.execute(
+        select(func.count(Meal.id))
         .join(MealDay, Meal.meal_day_id == MealDay.id)
-        .filter(Meal.is_takeout == True)
-        .filter(MealDay.date >= seven_days_ago)
-        .count()
+        .where(Meal.is_takeout.is_(True), MealDay.date >= seven_days_ago)
     )
-    db.close()
-    return {"count": count}
+    count = result.scalar()
+    return _cache_set("how-many-times", {"count": count}, ttl_seconds=60)
 
 
 @app.get("/api/rotation-suggestions")
-def rotation_suggestions(meal_type: Optional[str] = None):
-    db = SessionLocal()
-
-    # Get recent meals from the last 3 days
+async def rotation_suggestions(
+    meal_type: Optional[str] = None, db: AsyncSession = Depends(get_db)
+):
+    # Get recent meals from the last 3 days; these are excluded from the draw
     recent_cutoff = date.today() - timedelta(days=3)
-    recent_query = (
-        db.query(Meal.description).join(MealDay).filter(MealDay.date >= recent_cutoff)
+    recent_stmt = (
+        select(func.lower(func.trim(Meal.description)))
+        .join(MealDay)
+        .where(MealDay.date >= recent_cutoff, Meal.description.isnot(None))
     )
     if meal_type:
-        recent_query = recent_query.filter(Meal.type == meal_type)
-    recent_meals = recent_query.distinct().all()
-    recent_set = {r[0].strip().lower() for r in recent_meals if r[0]}
+        recent_stmt = recent_stmt.where(Meal.type == meal_type)
 
-    # Get favorite meals
-    favorite_query = db.query(Meal.description).filter(Meal.is_favorite == True)
+    recent_rows = (await db.execute(recent_stmt.distinct())).scalars()
+    recent_set = {text for text in recent_rows if text}
+
+    # Let the DB pick one favorite at random instead of materializing
+    # the whole pool into a Python set and list
+    favorite_stmt = select(Meal.description).where(
+        Meal.is_favorite == True, Meal.description.isnot(None)
+    )
     if meal_type:
-        favorite_query = favorite_query.filter(Meal.type == meal_type)
-    favorite_meals = favorite_query.distinct().all()
-    favorite_set = {
-        f[0].strip()
-        for f in favorite_meals
-        if f[0] and f[0].strip().lower() not in recent_set
-    }
+        favorite_stmt = favorite_stmt.where(Meal.type == meal_type)
+    if recent_set:
+        favorite_stmt = favorite_stmt.where(
+            func.lower(func.trim(Meal.description)).notin_(recent_set)
+        )
+
+    suggestion = (
+        await db.execute(favorite_stmt.distinct().order_by(func.rand()).limit(1))
+    ).scalar()
+
+    return {"suggestion": suggestion.strip() if suggestion else None}
 
-    db.close()
 
-    if not favorite_set:
-        return {"suggestion": None}
+@app.on_event("startup")
+async def _startup():
+    # Set up database connection and tables
+    await init_db()
 
-    return {"suggestion": random.choice(list(favorite_set))}
+    # Prime the date-keyed payday cache so the first request after a deploy
+    # doesn't pay for the computation
+    _payday_for(date.today())
 
 
 @app.exception_handler(HTTPException)
@@ -595,19 +880,23 @@ async def http_exc_handler(request: Request, exc: HTTPException):
     Ensures all API paths return JSON error shape.
     """
     if request.url.path.startswith("/api/"):
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code, content={"message": exc.detail}
         )
-    return JSONResponse(status_code=exc.status_code, content={"message": exc.detail})
+    return ORJSONResponse(status_code=exc.status_code, content={"message": exc.detail})
 
 
 # ------------------- Test Utilities ------------------------
 
 
-# Entry point for local dev
+# Entry point for local dev; uvloop/httptools swap the pure-Python event
+# loop and HTTP parser for their C implementations. Multi-process serving
+# should go through gunicorn -k uvicorn.workers.UvicornWorker instead.
 if __name__ == "__main__":
     uvicorn.run(
         app,
         host=str(os.getenv("SERVICE_HOST", "127.0.0.1")),
         port=int(os.getenv("SERVICE_PORT", "80")),
+        loop="uvloop",
+        http="httptools",
     )
@@ -1,7 +1,7 @@
 # models.py
 from sqlalchemy import (
-    create_engine,
     Column,
+    Index,
     Integer,
     Date,
     Boolean,
@@ -9,18 +9,28 @@ from sqlalchemy import (
     Enum,
     Text,
     ForeignKey,
+    UniqueConstraint,
 )
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import relationship
 import enum
 import os
+from functools import lru_cache
 from urllib.parse import quote_plus
 
 from dotenv import load_dotenv
-from urllib.parse import quote_plus
 
-# Load environment variables from .env file
-load_dotenv()
+__all__ = [
+    "Base",
+    "MealType",
+    "MealDay",
+    "Meal",
+    "get_database_url",
+    "get_engine",
+    "SessionLocal",
+    "init_db",
+]
 
 Base = declarative_base()
 
@@ -42,9 +52,28 @@ class MealDay(Base):
 
 class Meal(Base):
     __tablename__ = "meals"
+    __table_args__ = (
+        # Covers the "takeout meals in the last N days" count
+        Index("ix_meal_takeout_day", "is_takeout", "meal_day_id"),
+        # One meal row per (day, type); the backing unique index also covers
+        # the meals-for-day join plus per-type lookups, and lets the
+        # copy-week upsert key on it
+        UniqueConstraint("meal_day_id", "type", name="uq_meal_day_type"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     meal_day_id = Column(Integer, ForeignKey("meal_days.id"), nullable=False)
-    type = Column(Enum(MealType), nullable=False)
+    # Plain VARCHAR + CHECK instead of MySQL's native ENUM, whose ALTERs
+    # rewrite the whole table when a value is added
+    type = Column(
+        Enum(
+            MealType,
+            native_enum=False,
+            length=16,
+            create_constraint=True,
+            values_callable=lambda members: [member.value for member in members],
+        ),
+        nullable=False,
+    )
     description = Column(Text)
     cooking_user = Column(String(10), nullable=True)  # NEW: 'Joey' or 'Sam'
     is_favorite = Column(Boolean, default=False, nullable=False)
@@ -52,25 +81,54 @@ class Meal(Base):
     day = relationship("MealDay", back_populates="meals")
 
 
-# Database connection URL; you can configure it using environment variables.
-username = os.getenv("DB_USER", "")
-password = quote_plus(os.getenv("DB_PASS", ""))
-host = os.getenv("DB_HOST", "")
-port = os.getenv("DB_PORT", "")
-database = os.getenv("DB_NAME", "")
-DATABASE_URL = f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}"
-
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_size=10,
-    max_overflow=5,
-    pool_timeout=30,
-    pool_recycle=1800,
-    pool_pre_ping=True,
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@lru_cache(maxsize=1)
+def get_database_url():
+    """
+    Builds the connection URL from environment variables (and .env) on
+    first use, so importing the models has no side effects.
+    """
+    load_dotenv()
+    username = os.getenv("DB_USER", "")
+    password = quote_plus(os.getenv("DB_PASS", ""))
+    host = os.getenv("DB_HOST", "")
+    port = os.getenv("DB_PORT", "")
+    database = os.getenv("DB_NAME", "")
+    return f"mysql+aiomysql://{username}:{password}@{host}:{port}/{database}"
+
+
+@lru_cache(maxsize=1)
+def get_engine():
+    return create_async_engine(
+        get_database_url(),
+        # SQL echo formats every statement + params; keep it opt-in for debugging
+        echo=os.getenv("SQL_ECHO", "0") == "1",
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=3600,
+        pool_pre_ping=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def _session_factory():
+    return async_sessionmaker(get_engine(), autoflush=False, expire_on_commit=False)
+
+
+def SessionLocal():
+    # Callable-compatible with the old module-level async_sessionmaker
+    return _session_factory()()
+
+
+# Sentinel so repeated startups (e.g. test harnesses re-importing the app)
+# don't re-run DDL reflection against the database
+_db_ready = False
 
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+async def init_db():
+    global _db_ready
+    if _db_ready:
+        return
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    _db_ready = True